@@ -1,28 +1,51 @@
 from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, Depends, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator, HttpUrl, ConfigDict
-from typing import List, Dict, Any, Optional, Union, Annotated
+from pydantic import BaseModel, Field, validator, model_validator, HttpUrl, ConfigDict, StringConstraints
+from typing import List, Dict, Any, Optional, Union, Annotated, FrozenSet, Tuple
 import asyncio
-from contextlib import asynccontextmanager
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, suppress
 import logging
+import multiprocessing
+import os
 import time
 from datetime import datetime
 import hashlib
+import heapq
+import json
+import pickle
 import re
-import html
 from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, urljoin, parse_qsl, urlencode
 
 # NLP Libraries
 import spacy
+from spacy.tokens import Doc
 from newspaper import Article, Config
+from newspaper.utils import extract_meta_refresh
 from markdownify import markdownify as md
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer, BOOSTER_DICT, allcap_differential
 import yake
 import socials
 import socid_extractor
-import socialshares
-from spacy import displacy
+import lxml.html
+import aiohttp
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 # Configure logging
 logging.basicConfig(
@@ -32,15 +55,85 @@ logging.basicConfig(
 logger = logging.getLogger("nlp_api")
 
 # Constants
-EXCLUDED_ENTITY_TYPES = {"TIME", "DATE", "LANGUAGE", "PERCENT", "MONEY", "QUANTITY", "ORDINAL", "CARDINAL"}
+EXCLUDED_ENTITY_TYPES = frozenset({"TIME", "DATE", "LANGUAGE", "PERCENT", "MONEY", "QUANTITY", "ORDINAL", "CARDINAL"})
 STRIP_TEXT_RULES = ["a"]
 DEFAULT_USER_AGENT = "NLP/1.0.0 (Unix; Intel) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 SOCIAL_PLATFORMS = ["facebook", "pinterest", "linkedin", "reddit", "twitter", "instagram"]
+# Components each NER submission runs; everything else is skipped. Only summaries need senter for doc.sents.
+ENTITY_PIPES = ("ner",)
+SUMMARY_PIPES = ("ner", "senter")
+SENTIMENT_PIPES = ()  # VADER only needs spaCy's tokens
+KEYWORD_MAX_CHARS = 20000  # YAKE only sees the start of long texts
+KEYWORD_MAX_CHARS_LIMIT = 200_000  # Largest max_chars a caller may request
+KEYWORD_CACHE_SIZE = 512  # Memoised YAKE results kept in the API process
+SUMMARY_SENTENCES = 5  # Number of sentences in generated summaries
+SUMMARY_MIN_WORDS = 5  # Shorter sentences (bylines, captions, "Advertisement.") are not picked
+SUMMARY_IDEAL_WORDS = 20  # Sentence length favoured by the summarizer, as in newspaper
+SPACY_MAX_LENGTH = 2_000_000  # Max characters handed to the spaCy tokenizer
+MAX_DOC_TOKENS = 100_000  # Docs are truncated to this many tokens before the pipeline runs
+SPACY_BATCH_SIZE = int(os.getenv("NLP_SPACY_BATCH_SIZE", "16"))  # Max texts per nlp.pipe call
+# Processes for pure-Python CPU work, per uvicorn worker. Each is a spawned interpreter that imports the
+# full spaCy/newspaper/FastAPI stack, so the default of cpu_count - 1 multiplies memory by that factor.
+CPU_WORKERS = int(os.getenv("NLP_CPU_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
 CACHE_SIZE = 100  # Number of articles to keep in cache
+REDIS_URL = os.getenv("NLP_REDIS_URL")  # Shared article cache across workers; in-process only when unset
+ARTICLE_CACHE_TTL = int(os.getenv("NLP_ARTICLE_CACHE_TTL", "86400"))  # Seconds an article is kept in Redis
+ARTICLE_CACHE_PREFIX = "nlp-article"
+TRACKING_QUERY_PARAMS = frozenset({"fbclid", "gclid"})  # Dropped from URLs before hashing, along with utm_*
 API_VERSION = "1.0.0"
 
-# Cache for article processing
-article_cache = {}
+# Collapses whitespace in the HTML-stripping fallback in fetch_article
+_WS_RE = re.compile(r'\s+')
+_META_REFRESH_RE = re.compile(r'<meta[^>]+http-equiv\s*=\s*["\']?refresh', re.IGNORECASE)
+
+# Cache for article processing, ordered from least to most recently used.
+# When NLP_REDIS_URL is set this is an L1 in front of the shared Redis cache.
+article_cache: "OrderedDict[str, dict]" = OrderedDict()
+article_cache_lock = asyncio.Lock()
+# Articles currently being processed, so concurrent cache misses share one run
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Process pool for pure-Python CPU-bound work (YAKE, socid_extractor) that would otherwise contend on the GIL.
+# Created in the lifespan handler; workers are spawned rather than forked since the parent already runs thread pools.
+# A worker that dies (e.g. OOM-killed) breaks the whole pool, so run_cpu_bound replaces it under _cpu_pool_lock.
+_CPU_POOL: Optional[ProcessPoolExecutor] = None
+_cpu_pool_lock = asyncio.Lock()
+
+def _new_cpu_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def _warm_cpu_worker() -> int:
+    # Unpickling this function is what makes a spawned worker import this module
+    return os.getpid()
+
+async def _replace_broken_cpu_pool(broken: ProcessPoolExecutor):
+    """Swap in a fresh pool, unless a concurrent caller already replaced this one"""
+    global _CPU_POOL
+    async with _cpu_pool_lock:
+        if _CPU_POOL is broken:
+            logger.warning("A CPU worker process died, restarting the process pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            _CPU_POOL = _new_cpu_pool()
+
+async def run_cpu_bound(func, *args):
+    """Run func on the CPU pool, restarting the pool and retrying once if a worker died"""
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _CPU_POOL
+        if pool is None:
+            # Outside the lifespan (e.g. scripts), fall back to a thread
+            return await asyncio.to_thread(func, *args)
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            await _replace_broken_cpu_pool(pool)
+            if attempt:
+                raise
+
+# Shared HTTP session with connection pooling, created in the lifespan handler
+http_session: Optional[aiohttp.ClientSession] = None
+# Redis client backing FastAPICache, created in the lifespan handler when NLP_REDIS_URL is set
+redis_client: Optional[aioredis.Redis] = None
 
 # Models
 class KeywordResponse(BaseModel):
@@ -164,21 +257,32 @@ class ArticleAction(BaseModel):
     )
 
 class SummarizeAction(BaseModel):
-    text: str = Field(..., min_length=10, description="Text to summarize or extract tags from")
+    text: Optional[str] = Field(None, min_length=10, description="Text to summarize or extract tags from; defaults to the pre-tokenized words joined by spaces")
     max_length: Optional[int] = Field(None, description="Maximum length of summary")
+    max_chars: int = Field(KEYWORD_MAX_CHARS, ge=1, le=KEYWORD_MAX_CHARS_LIMIT, description="Maximum number of characters used for keyword extraction")
+    pretokenized: Optional[List[Annotated[str, StringConstraints(min_length=1)]]] = Field(None, description="Words of the already tokenized text; entity extraction skips tokenization when set")
     
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "text": "This is a sample text for extracting keywords and analyzing sentiment.",
-                "max_length": 100
+                "max_length": 100,
+                "max_chars": 20000
             }
         }
     )
+    
+    @model_validator(mode="after")
+    def require_text_or_words(self):
+        if self.text is None:
+            if not self.pretokenized:
+                raise ValueError("text is required unless pretokenized is given")
+            self.text = " ".join(self.pretokenized)
+        return self
 
 class EntityFilterOptions(BaseModel):
-    exclude_types: List[str] = Field(
-        default_factory=lambda: list(EXCLUDED_ENTITY_TYPES),
+    exclude_types: FrozenSet[str] = Field(
+        default=EXCLUDED_ENTITY_TYPES,
         description="Entity types to exclude"
     )
     min_length: int = Field(1, description="Minimum length of entity text")
@@ -212,6 +316,8 @@ class NLPComponents:
     _instance = None
     _nlp = None
     _sentiment_analyzer = None
+    _stop_words = None
+    _disabled_pipes: Dict[Tuple[str, ...], List[str]] = {}
     
     def __new__(cls):
         if cls._instance is None:
@@ -223,6 +329,9 @@ class NLPComponents:
         if self._nlp is None:
             logger.info("Loading SpaCy model...")
             self._nlp = spacy.load("en_core_web_md")
+            self._nlp.max_length = SPACY_MAX_LENGTH
+            # The standalone senter is much cheaper than the parser for sentence boundaries
+            self._nlp.enable_pipe("senter")
         return self._nlp
     
     @property
@@ -232,6 +341,41 @@ class NLPComponents:
             self._sentiment_analyzer = SentimentIntensityAnalyzer()
         return self._sentiment_analyzer
     
+    def disabled_pipes(self, pipes: Tuple[str, ...]) -> List[str]:
+        """Components not needed for pipes, including a shared tok2vec nothing enabled listens to"""
+        if pipes not in self._disabled_pipes:
+            needed = set(pipes)
+            for name, pipe in self.nlp.pipeline:
+                if needed.intersection(getattr(pipe, "listening_components", [])):
+                    needed.add(name)
+            disabled = [name for name in self.nlp.pipe_names if name not in needed]
+            logger.info(f"Pipeline for {', '.join(pipes) or 'tokenization'} skips: {', '.join(disabled)}")
+            self._disabled_pipes[pipes] = disabled
+        return self._disabled_pipes[pipes]
+    
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            self._stop_words = frozenset(self.nlp.Defaults.stop_words)
+        return self._stop_words
+    
+    def make_bounded_doc(self, text: Union[str, List[str]]) -> Doc:
+        """Tokenize text, or build a Doc from already tokenized words, keeping at most MAX_DOC_TOKENS tokens"""
+        if isinstance(text, str):
+            doc = self.nlp.make_doc(text[:self.nlp.max_length])
+        else:
+            doc = Doc(self.nlp.vocab, words=text)
+        if len(doc) > MAX_DOC_TOKENS:
+            logger.warning(f"Text too large ({len(doc)} tokens), truncated to {MAX_DOC_TOKENS} tokens")
+            doc = doc[:MAX_DOC_TOKENS].as_doc()
+        return doc
+    
+    def entities_docs(self, texts: List[Union[str, List[str]]], pipes: Tuple[str, ...] = ENTITY_PIPES, batch_size: int = SPACY_BATCH_SIZE):
+        """Run only the given pipes, skipping components that don't affect their output"""
+        docs = [self.make_bounded_doc(text) for text in texts]
+        logger.info(f"Running {', '.join(pipes) or 'tokenization'} on {len(docs)} docs ({sum(len(doc) for doc in docs)} tokens)")
+        return list(self.nlp.pipe(docs, batch_size=batch_size, disable=self.disabled_pipes(pipes)))
+    
     @lru_cache(maxsize=8)
     def get_keyword_extractor(self, language="en", n=1, dedup_lim=0.9, top=5):
         """Get a configured YAKE keyword extractor with caching"""
@@ -239,21 +383,111 @@ class NLPComponents:
         return yake.KeywordExtractor(lan=language, n=n, dedupLim=dedup_lim, top=top)
 
 
+# Batches concurrent NER requests into a single nlp.pipe consumer
+class NERBatcher:
+    def __init__(self, batch_size: int = SPACY_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the consumer task on the running event loop if it isn't running yet"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._consume())
+    
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._worker
+        self._worker = None
+        self._queue = None
+    
+    async def submit(self, text: Union[str, List[str]], pipes: Tuple[str, ...] = ENTITY_PIPES):
+        """Queue a text (or its already tokenized words) for the given pipes and wait for its Doc"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, pipes, future))
+        return await future
+    
+    async def _consume(self):
+        nlp_components = NLPComponents()
+        while True:
+            # Block for the first item, then drain whatever else is already waiting
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            # Submissions asking for the same pipes share one nlp.pipe call
+            groups: Dict[Tuple[str, ...], list] = {}
+            for text, pipes, future in batch:
+                if not future.done():
+                    groups.setdefault(pipes, []).append((text, future))
+                    
+            for pipes, group in groups.items():
+                try:
+                    docs = await asyncio.to_thread(
+                        nlp_components.entities_docs, [text for text, _ in group], pipes, self.batch_size
+                    )
+                except Exception as e:
+                    logger.error(f"Error running NER batch of {len(group)} texts: {str(e)}")
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                    
+                for (_, future), doc in zip(group, docs):
+                    if not future.done():
+                        future.set_result(doc)
+
+
+ner_batcher = NERBatcher()
+
+
 # Lifespan manager for application startup and shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global http_session, redis_client, _CPU_POOL
+    
     # Initialize NLP components on startup
     logger.info("Initializing NLP components...")
     components = NLPComponents()
+    http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=15),
+        headers={"User-Agent": DEFAULT_USER_AGENT},
+    )
+    if REDIS_URL:
+        logger.info("Connecting article cache to Redis...")
+        redis_client = aioredis.from_url(REDIS_URL)
+        FastAPICache.init(RedisBackend(redis_client), prefix=ARTICLE_CACHE_PREFIX, expire=ARTICLE_CACHE_TTL)
+    
     # Pre-load models to avoid lazy loading during first request
     _ = components.nlp
     _ = components.sentiment_analyzer
+    ner_batcher.start()
+    
+    # Spawned workers re-import this module, so pay that startup cost before serving requests
+    logger.info(f"Starting {CPU_WORKERS} CPU worker processes...")
+    _CPU_POOL = _new_cpu_pool()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(_CPU_POOL, _warm_cpu_worker) for _ in range(CPU_WORKERS)))
     logger.info("NLP API started successfully")
     
     yield
     
     # Cleanup on shutdown
     logger.info("Shutting down NLP API")
+    await ner_batcher.stop()
+    _CPU_POOL.shutdown(wait=False, cancel_futures=True)
+    _CPU_POOL = None
+    await http_session.close()
+    if redis_client is not None:
+        await redis_client.close()
+        redis_client = None
+        FastAPICache.reset()
     # Clear cache
     article_cache.clear()
 
@@ -266,6 +500,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -284,9 +519,48 @@ router = APIRouter(
 )
 
 # Helper Functions
+def _normalize_url(url: str) -> str:
+    """Normalize a URL so links to the same article share a cache key"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_QUERY_PARAMS
+    ))
+    # The fragment never reaches the server, so it is dropped too
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
 def get_cache_key(url: str) -> str:
     """Generate a cache key for a URL"""
-    return hashlib.md5(url.encode()).hexdigest()
+    url = _normalize_url(url)
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(url.encode())
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+def html_to_text(raw_html: str) -> str:
+    """Extract visible text from raw HTML, skipping script and style contents"""
+    if not raw_html:
+        return ""
+        
+    if HTMLParser is not None:
+        tree = HTMLParser(raw_html)
+        tree.strip_tags(["script", "style"])
+        root = tree.body or tree.root
+        text = root.text(separator=" ") if root is not None else ""
+    else:
+        # lxml is always available as a newspaper3k dependency
+        tree = lxml.html.fromstring(raw_html)
+        for element in tree.xpath("//script|//style"):
+            element.drop_tree()
+        text = " ".join(tree.itertext())
+        
+    return _WS_RE.sub(" ", text).strip()
+
+async def _download_html(url: str) -> str:
+    """Download a page on the shared session so connections are reused across articles."""
+    async with http_session.get(url) as response:
+        response.raise_for_status()
+        return await response.text(errors="replace")
 
 async def fetch_article(link: str):
     """Fetch and parse an article using the Newspaper library."""
@@ -296,32 +570,38 @@ async def fetch_article(link: str):
         config.request_timeout = 15
         config.fetch_images = True
         config.memoize_articles = True
-        config.follow_meta_refresh = True
+        # Meta refreshes are followed below on the shared session; newspaper would
+        # otherwise re-fetch them with a blocking request
+        config.follow_meta_refresh = False
+        
+        loop = asyncio.get_event_loop()
+        page_html = await _download_html(link)
         
+        # Follow a single meta refresh, as newspaper does; only pages that
+        # declare one pay for the HTML parse, and that runs off the event loop
+        if _META_REFRESH_RE.search(page_html):
+            refresh_url = await loop.run_in_executor(None, extract_meta_refresh, page_html)
+            if refresh_url:
+                page_html = await _download_html(urljoin(link, refresh_url))
+            
         article = Article(link, config=config, keep_article_html=True)
         
-        # Use asyncio to run blocking I/O operations in a separate thread
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, article.download)
-        await loop.run_in_executor(None, article.parse)
+        def download_and_parse():
+            article.download(input_html=page_html)
+            article.parse()
+        
+        # Parsing is CPU-bound, so run it in a separate thread
+        await loop.run_in_executor(None, download_and_parse)
         
         # If article text is too short, try alternative parsing
         if len(article.text) < 50:
             logger.info(f"Article text too short ({len(article.text)} chars), trying alternative parsing")
             # Try to extract text from HTML directly as fallback
-            clean_text = re.sub(r'<script.*?>.*?</script>', '', article.html, flags=re.DOTALL)
-            clean_text = re.sub(r'<style.*?>.*?</style>', '', clean_text, flags=re.DOTALL)
-            clean_text = re.sub(r'<[^>]*>', ' ', clean_text)
-            clean_text = html.unescape(clean_text)
-            clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+            clean_text = html_to_text(article.html)
             
             if len(clean_text) > len(article.text):
                 article.text = clean_text
                 
-        # Try to extract summary if not done already
-        if not article.summary:
-            await loop.run_in_executor(None, article.nlp)
-            
         return article
     except Exception as e:
         logger.error(f"Error fetching article {link}: {str(e)}")
@@ -330,43 +610,201 @@ async def fetch_article(link: str):
             detail=f"Could not fetch article: {str(e)}"
         )
 
-def extract_keywords(text: str, language="en", n=1, dedup_lim=0.9, top=5):
-    """Extract keywords using YAKE."""
+# Share-count endpoints per platform, as queried by the socialshares package
+async def _facebook_shares(session: aiohttp.ClientSession, url: str):
+    async with session.get("https://graph.facebook.com/", params={"id": url}) as response:
+        response.raise_for_status()
+        data = await response.json(content_type=None)
+    return data["share"]
+
+async def _linkedin_shares(session: aiohttp.ClientSession, url: str):
+    async with session.get("http://www.linkedin.com/countserv/count/share", params={"url": url, "format": "json"}) as response:
+        response.raise_for_status()
+        data = await response.json(content_type=None)
+    return data["count"]
+
+async def _pinterest_shares(session: aiohttp.ClientSession, url: str):
+    async with session.get("http://api.pinterest.com/v1/urls/count.json", params={"url": url}) as response:
+        response.raise_for_status()
+        text = await response.text()
+    # Pinterest responds with JSONP
+    data = json.loads(text[text.index("(") + 1:text.rindex(")")])
+    return data["count"]
+
+async def _reddit_shares(session: aiohttp.ClientSession, url: str):
+    async with session.get("http://buttons.reddit.com/button_info.json", params={"url": url, "format": "json"}) as response:
+        response.raise_for_status()
+        data = await response.json(content_type=None)
+    children = data["data"]["children"]
+    return {
+        "ups": sum(child["data"]["ups"] for child in children),
+        "downs": sum(child["data"]["downs"] for child in children),
+    }
+
+SHARE_COUNT_FETCHERS = {
+    "facebook": _facebook_shares,
+    "linkedin": _linkedin_shares,
+    "pinterest": _pinterest_shares,
+    "reddit": _reddit_shares,
+}
+
+async def fetch_social_shares(link: str, platforms: List[str] = SOCIAL_PLATFORMS) -> Dict[str, Any]:
+    """Fetch share counts for all supported platforms concurrently on the shared session"""
+    # Platforms without a public share-count API (e.g. twitter, instagram) are skipped
+    fetchers = {platform: SHARE_COUNT_FETCHERS[platform] for platform in platforms if platform in SHARE_COUNT_FETCHERS}
+    results = await asyncio.gather(
+        *(fetcher(http_session, link) for fetcher in fetchers.values()),
+        return_exceptions=True,
+    )
+    
+    counts = {}
+    for platform, result in zip(fetchers, results):
+        if isinstance(result, Exception):
+            logger.debug(f"Could not fetch {platform} shares for {link}: {result}")
+        else:
+            counts[platform] = result
+    return counts
+
+class DocSentiText:
+    """VADER SentiText built from the tokens of an already processed spaCy Doc"""
+    
+    def __init__(self, doc, analyzer: SentimentIntensityAnalyzer):
+        words_and_emoticons = []
+        for token in doc:
+            if token.is_space:
+                continue
+            if token.text in analyzer.emojis:
+                # VADER scores emojis through their textual description
+                words_and_emoticons.extend(analyzer.emojis[token.text].split())
+            elif not token.is_punct or token.text in analyzer.lexicon:
+                # Keep emoticons such as ":)" that spaCy marks as punctuation
+                words_and_emoticons.append(token.text)
+                
+        self.text = doc.text
+        self.words_and_emoticons = words_and_emoticons
+        self.is_cap_diff = allcap_differential(words_and_emoticons)
+
+# DocSentiText and sentiment_from_doc mirror SentimentIntensityAnalyzer.polarity_scores and call its
+# private _but_check, so they are tied to vaderSentiment 3.3.2 internals; recheck both when upgrading it.
+def sentiment_from_doc(doc) -> Dict[str, float]:
+    """Score sentiment with VADER's rules on spaCy's tokens instead of re-tokenizing the text"""
+    analyzer = NLPComponents().sentiment_analyzer
+    sentitext = DocSentiText(doc, analyzer)
+    words_and_emoticons = sentitext.words_and_emoticons
+    
+    # Same loop as SentimentIntensityAnalyzer.polarity_scores
+    sentiments = []
+    for i, item in enumerate(words_and_emoticons):
+        lowered = item.lower()
+        if lowered in BOOSTER_DICT:
+            sentiments.append(0)
+            continue
+        if i < len(words_and_emoticons) - 1 and lowered == "kind" and words_and_emoticons[i + 1].lower() == "of":
+            sentiments.append(0)
+            continue
+        sentiments = analyzer.sentiment_valence(0, sentitext, item, i, sentiments)
+        
+    sentiments = analyzer._but_check(words_and_emoticons, sentiments)
+    return analyzer.score_valence(sentiments, sentitext.text)
+
+# YAKE output depends only on the config and the text, so results are memoised in the API process
+# (not in the pool workers) and repeats never leave the event loop. Entries are keyed on a digest
+# of the text rather than the text itself, so the cache doesn't pin up to 512 full inputs.
+_keyword_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+def _extract_keyword_scores(text: str, language: str, n: int, dedup_lim: float, top: int):
+    """Run YAKE, returning hashable (keyword, score) pairs"""
+    nlp_components = NLPComponents()
+    extractor = nlp_components.get_keyword_extractor(
+        language=language, n=n, dedup_lim=dedup_lim, top=top
+    )
+    return tuple(extractor.extract_keywords(text))
+
+async def extract_keywords(text: str, language="en", n=1, dedup_lim=0.9, top=5, max_chars=KEYWORD_MAX_CHARS):
+    """Extract keywords using YAKE on the CPU pool, reusing memoised results."""
     if not text or len(text) < 10:
         return []
         
+    # Keywords concentrate in the lede, and YAKE's candidate set grows with the text
+    text = text[:max_chars]
+    
     try:
-        nlp_components = NLPComponents()
-        extractor = nlp_components.get_keyword_extractor(
-            language=language, n=n, dedup_lim=dedup_lim, top=top
-        )
-        keywords = extractor.extract_keywords(text)
-        return [KeywordResponse(keyword=kw, score=score) for kw, score in keywords]
+        # A cryptographic digest, since callers control the text and a collision would serve another text's keywords
+        text_digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cache_key = (text_digest, len(text), language, n, dedup_lim, top)
+        keywords = _keyword_cache.get(cache_key)
+        if keywords is None:
+            keywords = await run_cpu_bound(_extract_keyword_scores, text, language, n, dedup_lim, top)
+            _keyword_cache[cache_key] = keywords
+            while len(_keyword_cache) > KEYWORD_CACHE_SIZE:
+                _keyword_cache.popitem(last=False)
+        else:
+            _keyword_cache.move_to_end(cache_key)
+            
+        # YAKE output is trusted, so skip field validation
+        return [KeywordResponse.model_construct(keyword=kw, score=score) for kw, score in keywords]
     except Exception as e:
         logger.error(f"Error extracting keywords: {str(e)}")
         return []
 
+def summarize_doc(doc, keywords: Optional[List[KeywordResponse]] = None, max_sentences: int = SUMMARY_SENTENCES) -> str:
+    """Build an extractive summary from the top scoring sentences of a processed Doc."""
+    stop_words = NLPComponents().stop_words
+    frequencies = Counter(
+        token.lower_ for token in doc
+        if token.is_alpha and token.lower_ not in stop_words
+    )
+    if not frequencies:
+        return ""
+        
+    # Normalised word frequencies, boosted for words that appear in extracted keywords
+    max_frequency = max(frequencies.values())
+    weights = {word: count / max_frequency for word, count in frequencies.items()}
+    for keyword in keywords or []:
+        for word in keyword.keyword.lower().split():
+            if word in weights:
+                weights[word] += 1.0
+                
+    sentences = [sent for sent in doc.sents if sent.text.strip()]
+    sentence_words = [[token.lower_ for token in sent if token.is_alpha] for sent in sentences]
+    
+    def score(index: int) -> float:
+        words = sentence_words[index]
+        content_words = [word for word in words if word not in stop_words]
+        if not content_words:
+            return 0.0
+        density = sum(weights.get(word, 0.0) for word in content_words) / len(content_words)
+        # Like newspaper's summarizer, prefer sentences close to the ideal length
+        length_score = max(0.0, 1 - abs(SUMMARY_IDEAL_WORDS - len(words)) / SUMMARY_IDEAL_WORDS)
+        return density * (0.5 + 0.5 * length_score)
+        
+    # Fragments only compete when the text has nothing longer
+    candidates = [i for i, words in enumerate(sentence_words) if len(words) >= SUMMARY_MIN_WORDS]
+    if not candidates:
+        candidates = range(len(sentences))
+        
+    # Keep the selected sentences in their original order
+    top_indices = heapq.nlargest(max_sentences, candidates, key=score)
+    return "\n".join(sentences[i].text.strip() for i in sorted(top_indices))
+
 def filter_entities(doc, options: EntityFilterOptions = None):
     """Filter and deduplicate entities."""
     if options is None:
         options = EntityFilterOptions()
         
-    entities = [
-        EntityResponse(type=ent.label_, text=ent.text)
-        for ent in doc.ents
-        if ent.label_ not in options.exclude_types and len(ent.text) >= options.min_length
-    ]
-    
-    # Deduplicate entities
-    seen = set()
-    unique_entities = []
-    for entity in entities:
-        key = (entity.type, entity.text.lower())
-        if key not in seen:
-            seen.add(key)
-            unique_entities.append(entity)
+    exclude_types = options.exclude_types
+    min_length = options.min_length
+    
+    # Deduplicate in the same pass, keeping the first spelling of each entity
+    unique_ents = {}
+    for ent in doc.ents:
+        label = ent.label_
+        text = ent.text
+        if label not in exclude_types and len(text) >= min_length:
+            unique_ents.setdefault((label, text.lower()), text)
             
-    return unique_entities
+    # spaCy output is trusted, so skip field validation
+    return [EntityResponse.model_construct(type=label, text=text) for (label, _), text in unique_ents.items()]
 
 async def process_article_data(link: str):
     """Process article data with all NLP tasks"""
@@ -375,12 +813,9 @@ async def process_article_data(link: str):
     # Fetch article
     article = await fetch_article(link)
     
-    # Get NLP components
-    nlp_components = NLPComponents()
-    
-    # Process text in chunks if too large
+    # Very large texts are truncated by token count before NER
     text = article.text
-    doc = nlp_components.nlp(text[:500000]) if len(text) > 500000 else nlp_components.nlp(text)
+    doc = await ner_batcher.submit(text, SUMMARY_PIPES)
     
     # Process all tasks concurrently
     tasks = []
@@ -398,33 +833,19 @@ async def process_article_data(link: str):
     tasks.append(social_accounts_task)
     
     # Get social shares
-    social_shares_task = asyncio.create_task(asyncio.to_thread(
-        lambda: socialshares.fetch(link, SOCIAL_PLATFORMS)
-    ))
+    social_shares_task = asyncio.create_task(fetch_social_shares(link))
     tasks.append(social_shares_task)
     
     # Sentiment analysis
-    sentiment_task = asyncio.create_task(asyncio.to_thread(
-        lambda: nlp_components.sentiment_analyzer.polarity_scores(text)
-    ))
+    sentiment_task = asyncio.create_task(asyncio.to_thread(sentiment_from_doc, doc))
     tasks.append(sentiment_task)
     
-    # Generate SpaCy HTML visualization
-    spacy_html_task = asyncio.create_task(asyncio.to_thread(
-        lambda: displacy.render(doc, style="ent")
-    ))
-    tasks.append(spacy_html_task)
-    
     # Extract keywords
-    keywords_task = asyncio.create_task(asyncio.to_thread(
-        lambda: extract_keywords(text, top=5)
-    ))
+    keywords_task = asyncio.create_task(extract_keywords(text, top=5))
     tasks.append(keywords_task)
     
     # Extract potential accounts
-    accounts_task = asyncio.create_task(asyncio.to_thread(
-        lambda: socid_extractor.extract(text)
-    ))
+    accounts_task = asyncio.create_task(run_cpu_bound(socid_extractor.extract, text))
     tasks.append(accounts_task)
     
     try:
@@ -436,9 +857,8 @@ async def process_article_data(link: str):
         social_accounts = results[1] if not isinstance(results[1], Exception) else {}
         social_shares = results[2] if not isinstance(results[2], Exception) else {}
         sentiment_scores = results[3] if not isinstance(results[3], Exception) else {"compound": 0, "pos": 0, "neg": 0, "neu": 0}
-        spacy_html = results[4] if not isinstance(results[4], Exception) else ""
-        keywords = results[5] if not isinstance(results[5], Exception) else []
-        accounts = results[6] if not isinstance(results[6], Exception) else {}
+        keywords = results[4] if not isinstance(results[4], Exception) else []
+        accounts = results[5] if not isinstance(results[5], Exception) else {}
         
         # Log any exceptions
         for i, result in enumerate(results):
@@ -452,9 +872,11 @@ async def process_article_data(link: str):
         social_accounts = {}
         social_shares = {}
         sentiment_scores = {"compound": 0, "positive": 0, "negative": 0, "neutral": 0}
-        spacy_html = ""
         keywords = []
         accounts = {}
+        
+    # Summarize from the already processed Doc, weighting sentences by the extracted keywords
+    summary = await asyncio.to_thread(summarize_doc, doc, keywords)
     
     # Calculate processing time
     processing_time = time.time() - start_time
@@ -465,7 +887,7 @@ async def process_article_data(link: str):
         text=article.text,
         markdown=md(article.article_html, newline_style="BACKSLASH", strip=STRIP_TEXT_RULES, heading_style="ATX"),
         html=article.article_html,
-        summary=article.summary,
+        summary=summary,
         keywords=keywords,
         authors=article.authors,
         banner=article.top_image,
@@ -487,26 +909,183 @@ async def get_entity_filter_options(
     return EntityFilterOptions(exclude_types=exclude_types, min_length=min_length)
 
 # Cache management
-def manage_cache_size():
-    """Ensure cache doesn't exceed maximum size"""
-    if len(article_cache) > CACHE_SIZE:
-        # Remove oldest items
-        keys_to_remove = sorted(article_cache.keys(), key=lambda k: article_cache[k].get("timestamp", 0))[:len(article_cache) - CACHE_SIZE]
-        for key in keys_to_remove:
-            del article_cache[key]
-        logger.info(f"Cache cleaned up, removed {len(keys_to_remove)} items")
+def _redis_cache_key(cache_key: str) -> str:
+    return f"{FastAPICache.get_prefix()}:{cache_key}"
+
+def _article_index_keys() -> Tuple[str, str]:
+    """Sorted sets of cached article keys, scored by creation date and by when they were cached"""
+    prefix = FastAPICache.get_prefix()
+    return f"{prefix}-index:created", f"{prefix}-index:cached"
+
+def _creation_date(cached_item: dict) -> datetime:
+    """Date cached articles are ordered by: the article's own date, else when it was cached"""
+    article_date = cached_item["data"].date
+    if article_date:
+        # Timezone-aware dates are compared as naive ones, like the cache timestamps
+        return article_date.replace(tzinfo=None)
+    return datetime.fromtimestamp(cached_item.get("timestamp", 0))
+
+async def _index_article(cache_key: str, cached_item: dict):
+    """Add an article to the Redis listing index and drop entries whose articles have expired"""
+    created_index, cached_index = _article_index_keys()
+    cached_at = cached_item["timestamp"]
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.zadd(created_index, {cache_key: _creation_date(cached_item).timestamp()})
+        pipe.zadd(cached_index, {cache_key: cached_at})
+        await pipe.execute()
+        
+    expired = await redis_client.zrangebyscore(cached_index, "-inf", cached_at - FastAPICache.get_expire())
+    if expired:
+        await _unindex_articles(expired)
+
+async def _unindex_articles(cache_keys: List[Union[str, bytes]]):
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for index in _article_index_keys():
+            pipe.zrem(index, *cache_keys)
+        await pipe.execute()
+
+async def _remember_article(cache_key: str, cached_item: dict):
+    """Put an item in the in-process cache, evicting the least recently used items"""
+    removed = 0
+    async with article_cache_lock:
+        article_cache[cache_key] = cached_item
+        article_cache.move_to_end(cache_key)
+        while len(article_cache) > CACHE_SIZE:
+            article_cache.popitem(last=False)
+            removed += 1
+    if removed:
+        logger.info(f"Cache cleaned up, removed {removed} items")
+
+async def store_article_cache(cache_key: str, result: ArticleResponse):
+    """Save an article to the in-process cache and, if configured, to Redis"""
+    cached_item = {
+        "data": result,
+        "timestamp": time.time()
+    }
+    await _remember_article(cache_key, cached_item)
+    
+    if redis_client is not None:
+        try:
+            await FastAPICache.get_backend().set(
+                _redis_cache_key(cache_key), pickle.dumps(cached_item), expire=FastAPICache.get_expire()
+            )
+            await _index_article(cache_key, cached_item)
+        except Exception as e:
+            logger.warning(f"Could not write {cache_key} to Redis: {str(e)}")
+
+def _load_cached_item(raw: bytes) -> Optional[dict]:
+    """Unpickle a Redis cache entry, treating corrupt or incompatible entries as missing"""
+    try:
+        return pickle.loads(raw)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cached article: {str(e)}")
+        return None
+
+def _load_cached_items(cache_keys: List[str], values: List[Optional[bytes]]) -> Dict[str, dict]:
+    cached_items = {}
+    for cache_key, raw in zip(cache_keys, values):
+        cached_item = _load_cached_item(raw) if raw is not None else None
+        if cached_item is not None:
+            cached_items[cache_key] = cached_item
+    return cached_items
+
+async def get_cached_article(cache_key: str) -> Optional[dict]:
+    """Look up an article in the in-process cache, falling back to Redis"""
+    async with article_cache_lock:
+        cached_item = article_cache.get(cache_key)
+        if cached_item is not None:
+            article_cache.move_to_end(cache_key)
+            return cached_item
+            
+    if redis_client is None:
+        return None
+        
+    try:
+        raw = await FastAPICache.get_backend().get(_redis_cache_key(cache_key))
+    except Exception as e:
+        logger.warning(f"Could not read {cache_key} from Redis: {str(e)}")
+        return None
+    if raw is None:
+        return None
+        
+    cached_item = _load_cached_item(raw)
+    if cached_item is None:
+        return None
+    await _remember_article(cache_key, cached_item)
+    return cached_item
+
+async def _redis_cached_articles_page(offset: int, limit: int) -> Tuple[int, List[Tuple[str, dict]]]:
+    created_index, _ = _article_index_keys()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.zcard(created_index)
+        pipe.zrevrange(created_index, offset, offset + limit - 1)
+        total_articles, keys = await pipe.execute()
+    if not keys:
+        return total_articles, []
+        
+    cache_keys = [key.decode() for key in keys]
+    values = await redis_client.mget([_redis_cache_key(cache_key) for cache_key in cache_keys])
+    # Unpickling full articles is CPU work, keep it off the event loop
+    cached_items = await asyncio.to_thread(_load_cached_items, cache_keys, values)
+    
+    # Expired or unreadable entries are dropped from the index as they are found
+    missing = [cache_key for cache_key in cache_keys if cache_key not in cached_items]
+    if missing:
+        await _unindex_articles(missing)
+        
+    # The in-process copy is at least as fresh as the Redis one
+    async with article_cache_lock:
+        for cache_key in cached_items:
+            if cache_key in article_cache:
+                cached_items[cache_key] = article_cache[cache_key]
+                
+    page = [(cache_key, cached_items[cache_key]) for cache_key in cache_keys if cache_key in cached_items]
+    return total_articles - len(missing), page
+
+async def get_cached_articles_page(offset: int, limit: int) -> Tuple[int, List[Tuple[str, dict]]]:
+    """Return the number of cached articles and one page of (cache key, cached item), most recently created first"""
+    if redis_client is not None:
+        try:
+            return await _redis_cached_articles_page(offset, limit)
+        except Exception as e:
+            logger.warning(f"Could not read cached articles from Redis: {str(e)}")
+            
+    async with article_cache_lock:
+        entries = [
+            (_creation_date(cached_item), cache_key, cached_item)
+            for cache_key, cached_item in article_cache.items()
+            if cached_item.get("data")
+        ]
+    # Only the requested page needs ordering: pick the most recent offset + limit
+    # entries by creation date (O(n log k)) instead of sorting the whole cache
+    top_entries = heapq.nlargest(offset + limit, entries, key=lambda entry: entry[0])
+    return len(entries), [(cache_key, cached_item) for _, cache_key, cached_item in top_entries[offset:]]
+
+async def _process_and_store_article(url: str, cache_key: str):
+    result = await process_article_data(url)
+    await store_article_cache(cache_key, result)
+    return result
+
+async def process_and_cache_article(url: str, cache_key: str):
+    """Process an article and cache it, joining any run already in flight for the same key"""
+    async with article_cache_lock:
+        task = _inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(_process_and_store_article(url, cache_key))
+            _inflight[cache_key] = task
+            task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+        else:
+            logger.info(f"Joining in-flight processing for {url}")
+            
+    # Shield so one cancelled request doesn't abort work other callers are waiting on
+    return await asyncio.shield(task)
 
 # Background task to update article cache
 async def update_article_cache(url: str, cache_key: str):
     """Update the cache for a given article URL"""
     try:
         logger.info(f"Updating cache for {url}")
-        result = await process_article_data(url)
-        article_cache[cache_key] = {
-            "data": result,
-            "timestamp": time.time()
-        }
-        manage_cache_size()
+        await process_and_cache_article(url, cache_key)
         logger.info(f"Cache updated for {url}")
     except Exception as e:
         logger.error(f"Error updating cache for {url}: {str(e)}")
@@ -528,9 +1107,9 @@ async def process_article(
         cache_key = get_cache_key(str(article.link))
         
         # Check cache if enabled
-        if article.cache and cache_key in article_cache:
+        cached_item = await get_cached_article(cache_key) if article.cache else None
+        if cached_item is not None:
             logger.info(f"Using cached data for {article.link}")
-            cached_item = article_cache[cache_key]
             result = cached_item.get("data")
             
             # Update the cache in the background if older than 1 hour
@@ -541,14 +1120,7 @@ async def process_article(
         
         # Process the article
         logger.info(f"Processing article: {article.link}")
-        result = await process_article_data(str(article.link))
-        
-        # Save to cache
-        article_cache[cache_key] = {
-            "data": result,
-            "timestamp": time.time()
-        }
-        manage_cache_size()
+        result = await process_and_cache_article(str(article.link), cache_key)
         
         return {"data": result, "cached": False}
     except HTTPException as e:
@@ -573,49 +1145,16 @@ async def get_cached_articles(
     offset: int = Query(default=0, ge=0, description="Number of articles to skip")
 ):
     try:
-        # Convert cache to list of cached articles with metadata
-        cached_articles = []
-        
-        for cache_key, cached_item in article_cache.items():
-            article_data = cached_item.get("data")
-            timestamp = cached_item.get("timestamp", 0)
-            
-            if article_data:
-                # Convert cache timestamp to datetime
-                cached_at = datetime.fromtimestamp(timestamp)
-                
-                # Handle article date - make it timezone-naive if it's timezone-aware
-                article_date = article_data.date
-                if article_date:
-                    # If the article date is timezone-aware, convert to naive
-                    if article_date.tzinfo is not None:
-                        article_date = article_date.replace(tzinfo=None)
-                    creation_date = article_date
-                else:
-                    creation_date = cached_at
-                
-                cached_articles.append({
-                    "cache_key": cache_key,
-                    "cached_at": cached_at,
-                    "creation_date": creation_date,
-                    "article": article_data
-                })
-        
-        # Sort by creation date in descending order (most recent first)
-        cached_articles.sort(key=lambda x: x["creation_date"], reverse=True)
-        
-        # Apply pagination
-        total_articles = len(cached_articles)
-        paginated_articles = cached_articles[offset:offset + limit]
+        total_articles, page = await get_cached_articles_page(offset, limit)
         
         # Format response
         response_articles = [
             CachedArticleResponse(
-                cache_key=item["cache_key"],
-                cached_at=item["cached_at"],
-                article=item["article"]
+                cache_key=cache_key,
+                cached_at=datetime.fromtimestamp(cached_item.get("timestamp", 0)),
+                article=cached_item["data"]
             )
-            for item in paginated_articles
+            for cache_key, cached_item in page
         ]
         
         logger.info(f"Retrieved {len(response_articles)} cached articles (total: {total_articles})")
@@ -643,9 +1182,7 @@ async def get_cached_articles(
 )
 async def extract_tags(article: SummarizeAction):
     try:
-        keywords = await asyncio.to_thread(
-            extract_keywords, article.text, n=3, top=5
-        )
+        keywords = await extract_keywords(article.text, n=3, top=5, max_chars=article.max_chars)
         return {"data": keywords}
     except Exception as e:
         logger.error(f"Error extracting tags: {str(e)}", exc_info=True)
@@ -663,10 +1200,9 @@ async def extract_tags(article: SummarizeAction):
 )
 async def analyze_sentiment(article: SummarizeAction):
     try:
-        nlp_components = NLPComponents()
-        sentiment = await asyncio.to_thread(
-            nlp_components.sentiment_analyzer.polarity_scores, article.text
-        )
+        # Same Doc-based scoring as /article, so both endpoints agree on the same text
+        doc = await ner_batcher.submit(article.text, SENTIMENT_PIPES)
+        sentiment = await asyncio.to_thread(sentiment_from_doc, doc)
         # VADER returns {'neg': 0.1, 'neu': 0.2, 'pos': 0.7, 'compound': 0.5}
         # Our model expects field names: negative, neutral, positive, compound
         return {"data": SentimentResponse(**sentiment)}
@@ -689,14 +1225,11 @@ async def extract_entities(
     filter_options: EntityFilterOptions = Depends(get_entity_filter_options),
 ):
     try:
-        nlp_components = NLPComponents()
-        
-        # Process text in chunks if too large
-        if len(article.text) > 500000:
-            doc = await asyncio.to_thread(nlp_components.nlp, article.text[:500000])
-            logger.warning(f"Text too large ({len(article.text)} chars), truncated to 500K chars")
+        if article.pretokenized:
+            # The Doc is built from the caller's words in the batcher thread, so only the pipeline components run
+            doc = await ner_batcher.submit(article.pretokenized[:MAX_DOC_TOKENS])
         else:
-            doc = await asyncio.to_thread(nlp_components.nlp, article.text)
+            doc = await ner_batcher.submit(article.text)
             
         entities = await asyncio.to_thread(filter_entities, doc, filter_options)
         return {"data": entities}
@@ -716,14 +1249,8 @@ async def extract_entities(
 )
 async def summarize_text(article: SummarizeAction):
     try:
-        async def _summarize():
-            # Create a temporary Article object for summarization
-            temp_article = Article(url='')
-            temp_article.set_text(article.text)
-            temp_article.nlp()
-            return temp_article.summary
-            
-        summary = await asyncio.to_thread(_summarize)
+        doc = await ner_batcher.submit(article.text, SUMMARY_PIPES)
+        summary = await asyncio.to_thread(summarize_doc, doc)
         
         # Truncate if max_length is specified
         if article.max_length and len(summary) > article.max_length: